@@ -112,6 +112,23 @@ def load_data(file_path):
         'insatisfeito': 'Dissatisfied',
         'muito-insatisfeito': 'Very Dissatisfied'
     })
+
+    # Numeric satisfaction: 1-5 score and -2 to +2 weight (nullable, so missing
+    # or unmapped answers stay NA)
+    df['satisfaction_score'] = df['satisfaction_level'].map({
+        'Very Satisfied': 5,
+        'Satisfied': 4,
+        'Neutral': 3,
+        'Dissatisfied': 2,
+        'Very Dissatisfied': 1
+    }).astype('Int8')
+    df['satisfaction_numeric'] = df['satisfaction_level'].map({
+        'Very Satisfied': 2,
+        'Satisfied': 1,
+        'Neutral': 0,
+        'Dissatisfied': -1,
+        'Very Dissatisfied': -2
+    }).astype('Int8')
     
     # Extract numeric values from area-util
     def parse_area(area_str):
@@ -183,7 +200,7 @@ def load_data(file_path):
     for reason in dissatisfaction_reasons:
         df[f'reason_{reason}'] = df['insatisfacao-motivos'].apply(
             lambda x: 1 if isinstance(x, list) and reason in x else 0
-        )
+        ).astype('uint8')
     
     # Clean professional situation
     df['employment_status'] = df['situacao-profissional_primary'].map({
@@ -206,6 +223,19 @@ def load_data(file_path):
     })
 
     df['distrito'] = df['distrito'].str.capitalize()
+
+    # Store low-cardinality columns as categoricals so grouping and filtering
+    # work on integer codes instead of strings
+    df['satisfaction_level'] = df['satisfaction_level'].astype(pd.CategoricalDtype(
+        categories=['Very Dissatisfied', 'Dissatisfied', 'Neutral', 'Satisfied', 'Very Satisfied'],
+        ordered=True
+    ))
+    df['rent_burden'] = df['rent_burden'].astype(pd.CategoricalDtype(
+        categories=['≤30% (Affordable)', '31-50% (Moderate)', '51-80% (High)', '>80% (Very High)', 'Unknown'],
+        ordered=True
+    ))
+    df['housing_situation'] = df['housing_situation'].astype('category')
+    df['distrito'] = df['distrito'].astype('category')
     
     return df
 
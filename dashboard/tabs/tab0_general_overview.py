@@ -30,15 +30,7 @@ def show_visao_geral_tab(df):
         df["housing_situation"] == "Others"
     ).mean() * 100
 
-    # Calculate satisfaction score (1-5 scale)
-    satisfaction_mapping = {
-        "Very Satisfied": 5,
-        "Satisfied": 4,
-        "Neutral": 3,
-        "Dissatisfied": 2,
-        "Very Dissatisfied": 1,
-    }
-    df["satisfaction_score"] = df["satisfaction_level"].map(satisfaction_mapping)
+    # Average satisfaction score (1-5 scale, computed at load time)
     avg_satisfaction = df["satisfaction_score"].mean()
 
     # Header and Key Metrics Row with enhanced styling
@@ -188,7 +180,7 @@ def show_visao_geral_tab(df):
         st.subheader("Mapa de Indicadores por Distrito")
         # Calculate satisfaction score by district
         district_satisfaction = (
-            df.groupby("distrito")["satisfaction_score"]
+            df.groupby("distrito", observed=True)["satisfaction_score"]
             .agg(["mean", "count"])
             .reset_index()
         )
@@ -549,7 +541,10 @@ def show_visao_geral_tab(df):
             )
         else:
             housing_counts = (
-                filtered_df["housing_situation"].value_counts().reset_index()
+                filtered_df["housing_situation"]
+                .value_counts()
+                .loc[lambda counts: counts > 0]
+                .reset_index()
             )
             housing_counts.columns = ["Housing Situation", "Count"]
 
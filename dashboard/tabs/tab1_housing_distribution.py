@@ -1,7 +1,6 @@
 # tab1_housing_distribution.py
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
 import sys
 from pathlib import Path
@@ -255,7 +254,12 @@ def show_housing_distribution_tab(df):
             st.subheader("Análise do Peso da Renda")
 
             # Create donut chart for rent burden categories
-            rent_burden_counts = filtered_df["rent_burden"].value_counts().reset_index()
+            rent_burden_counts = (
+                filtered_df["rent_burden"]
+                .value_counts()
+                .loc[lambda counts: counts > 0]
+                .reset_index()
+            )
             rent_burden_counts.columns = ["Rent Burden", "Count"]
 
             fig = px.pie(
@@ -603,23 +607,7 @@ def show_housing_distribution_tab(df):
     # Criar um dataframe para análise de satisfação por estratégia
     satisfaction_by_strategy = []
     
-    # Mapear níveis de satisfação para valores numéricos para cálculo de média
-    satisfaction_map = {
-        'muito-satisfeito': 5,
-        'satisfeito': 4,
-        'indiferente': 3,
-        'insatisfeito': 2,
-        'muito-insatisfeito': 1
-    }
-    
-    # Função para extrair o valor numérico da satisfação principal
-    def get_satisfaction_value(satisfacao_list):
-        if isinstance(satisfacao_list, list) and len(satisfacao_list) > 0:
-            return satisfaction_map.get(satisfacao_list[0], np.nan)
-        return np.nan
-    
-    # Aplicar função para criar coluna numérica de satisfação
-    df['satisfaction_numeric'] = df['satisfacao'].apply(get_satisfaction_value)
+    # A pontuação de satisfação (1-5) é calculada no carregamento dos dados
     
     # Analisar satisfação para estratégias de arrendamento
     for strategy in rent_strategy_map.keys():
@@ -627,7 +615,7 @@ def show_housing_distribution_tab(df):
             lambda x: isinstance(x, list) and strategy in x
         )]
         
-        avg_satisfaction = strategy_df['satisfaction_numeric'].mean()
+        avg_satisfaction = strategy_df['satisfaction_score'].mean()
         if not pd.isna(avg_satisfaction):
             satisfaction_by_strategy.append({
                 'Estratégia': rent_strategy_map.get(strategy, strategy),
@@ -641,7 +629,7 @@ def show_housing_distribution_tab(df):
             lambda x: isinstance(x, list) and strategy in x
         )]
         
-        avg_satisfaction = strategy_df['satisfaction_numeric'].mean()
+        avg_satisfaction = strategy_df['satisfaction_score'].mean()
         if not pd.isna(avg_satisfaction):
             satisfaction_by_strategy.append({
                 'Estratégia': buy_strategy_map.get(strategy, strategy),
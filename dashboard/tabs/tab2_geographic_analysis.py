@@ -36,10 +36,10 @@ def show_geographic_analysis_tab(df):
         total_districts = df['distrito'].nunique()
         st.metric("Total de Distritos", total_districts)
     with col2:
-        most_expensive_district = df[df['housing_situation'] == 'Arrendamento'].groupby('distrito')['valor-mensal-renda'].mean().idxmax()
+        most_expensive_district = df[df['housing_situation'] == 'Arrendamento'].groupby('distrito', observed=True)['valor-mensal-renda'].mean().idxmax()
         st.metric("Distrito Mais Caro (Arrendamento)", most_expensive_district.capitalize())
     with col3:
-        highest_ownership = df.groupby('distrito')['housing_situation'].apply(lambda x: (x == 'Casa Própria').mean() * 100).idxmax()
+        highest_ownership = df.groupby('distrito', observed=True)['housing_situation'].apply(lambda x: (x == 'Casa Própria').mean() * 100).idxmax()
         st.metric("Taxa Mais Alta de Propriedade", highest_ownership.capitalize())
     
     # Create map placeholders
@@ -48,7 +48,7 @@ def show_geographic_analysis_tab(df):
     with col1:
         # Districts distribution with improved aesthetics
         st.subheader("Distribuição Habitacional por Distrito")
-        district_counts = df.groupby(['distrito', 'housing_situation']).size().reset_index(name='count')
+        district_counts = df.groupby(['distrito', 'housing_situation'], observed=True).size().reset_index(name='count')
         fig = px.bar(
             district_counts,
             x='distrito',
@@ -109,7 +109,7 @@ def show_geographic_analysis_tab(df):
     st.subheader("Distribuição das Situações Habitacionais")
     
     # Calculate percentages
-    district_percentages = df.groupby('distrito')['housing_situation'].value_counts(normalize=True).mul(100).round(1).reset_index(name='percentage')
+    district_percentages = df.groupby('distrito', observed=True)['housing_situation'].value_counts(normalize=True).mul(100).round(1).reset_index(name='percentage')
     district_percentages = district_percentages.rename(columns={'level_1': 'housing_situation'})
     district_percentages['distrito'] = district_percentages['distrito'].str.capitalize()
     
@@ -242,7 +242,7 @@ def show_geographic_analysis_tab(df):
         rent_burden_data = df[df['housing_situation'] == 'Arrendamento'].dropna(subset=['rent_burden', 'distrito'])
         rent_burden_data['distrito'] = rent_burden_data['distrito'].str.capitalize()
         if not rent_burden_data.empty:
-            burden_counts = rent_burden_data.groupby(['distrito', 'rent_burden']).size().reset_index(name='count')
+            burden_counts = rent_burden_data.groupby(['distrito', 'rent_burden'], observed=True).size().reset_index(name='count')
             
             fig = px.bar(
                 burden_counts,
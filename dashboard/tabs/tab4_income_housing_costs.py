@@ -116,7 +116,12 @@ def show_income_housing_costs_tab(df):
 
         # Criar gráfico circular das categorias de sobrecarga de renda
         if not rent_data.empty:
-            rent_burden_counts = rent_data["rent_burden"].value_counts().reset_index()
+            rent_burden_counts = (
+                rent_data["rent_burden"]
+                .value_counts()
+                .loc[lambda counts: counts > 0]
+                .reset_index()
+            )
             rent_burden_counts.columns = ["Sobrecarga de Renda", "Contagem"]
 
             # Mapear categorias para português
@@ -384,7 +389,7 @@ def show_income_housing_costs_tab(df):
         # Renda média por distrito
         district_rent = (
             df[df["housing_situation"] == "Arrendamento"]
-            .groupby("distrito")["valor-mensal-renda"]
+            .groupby("distrito", observed=True)["valor-mensal-renda"]
             .mean()
             .reset_index()
         )
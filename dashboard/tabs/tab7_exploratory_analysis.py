@@ -272,7 +272,13 @@ def show_exploratory_analysis_tab(df):
         if chart_type == "Gráfico de Barras":
             if agg_option == "Contagem":
                 # Fix for the bar chart - Create proper dataframe for value counts
-                value_counts = filtered_df[x_axis].value_counts().reset_index()
+                # Categorical columns report unobserved categories with zero counts
+                value_counts = (
+                    filtered_df[x_axis]
+                    .value_counts()
+                    .loc[lambda counts: counts > 0]
+                    .reset_index()
+                )
                 value_counts.columns = [x_axis, "count"]  # Properly rename columns
 
                 fig = px.bar(
@@ -288,7 +294,9 @@ def show_exploratory_analysis_tab(df):
                     agg_option.lower()
                 ]
                 agg_data = (
-                    filtered_df.groupby(x_axis)[y_axis].agg(agg_func).reset_index()
+                    filtered_df.groupby(x_axis, observed=True)[y_axis]
+                    .agg(agg_func)
+                    .reset_index()
                 )
                 fig = px.bar(
                     agg_data,
@@ -327,7 +335,9 @@ def show_exploratory_analysis_tab(df):
             )
 
         else:  # Pie Chart
-            value_counts = filtered_df[x_axis].value_counts()
+            value_counts = (
+                filtered_df[x_axis].value_counts().loc[lambda counts: counts > 0]
+            )
             fig = px.pie(
                 names=value_counts.index,
                 values=value_counts.values,
@@ -362,7 +372,9 @@ def show_exploratory_analysis_tab(df):
                         f"- Número de valores únicos de {x_axis}: {filtered_df[x_axis].nunique()}"
                     )
                 else:
-                    agg_data = filtered_df.groupby(x_axis)[y_axis].agg(agg_func)
+                    agg_data = filtered_df.groupby(x_axis, observed=True)[y_axis].agg(
+                        agg_func
+                    )
                     max_category = agg_data.idxmax()
                     min_category = agg_data.idxmin()
                     st.write(
@@ -390,7 +402,7 @@ def show_exploratory_analysis_tab(df):
                     st.write("- Correlação fraca detetada")
 
             elif chart_type == "Gráfico de Caixa":
-                grouped = filtered_df.groupby(x_axis)[y_axis]
+                grouped = filtered_df.groupby(x_axis, observed=True)[y_axis]
                 st.write(
                     f"- Categoria com {y_axis} mediano mais alto: {grouped.median().idxmax()}"
                 )